@@ -1,18 +1,25 @@
 import bpy
-import bmesh
 import os
 import csv
 import hashlib
 import json
+import numpy as np
+from array import array
 from collections import defaultdict
 
 from math import radians
-from mathutils import Quaternion
+from mathutils import Euler, Quaternion
+from bpy.app.handlers import persistent
 
+IS_B34 = bpy.app.version >= (3, 4, 0)
 IS_B40 = bpy.app.version >= (4, 0, 0)
 
 SPECULAR_INPUT_NAME = 'Specular IOR Level' if IS_B40 else 'Specular'
 
+HALF_PI = radians(90)
+
+IDENTITY_QUATERNION = (1.0, 0.0, 0.0, 0.0)
+
 def importWoWOBJAddon(objectFile, settings):
     importWoWOBJ(objectFile, None, settings)
 
@@ -43,6 +50,131 @@ def loadImage(textureLocation):
 
     return bpy.data.images[imageName]
 
+# Materials created by previous imports, keyed by a hash of their texture and settings.
+# Only names are stored as references to ID data do not survive loading another file.
+MATERIAL_CACHE = {}
+
+def getMaterialCacheKey(textureLocation, blendMode, settings):
+    key = textureLocation + str(blendMode) + str(settings.useAlpha) + str(settings.useTerrainBlending) + str(settings.createEmissiveMaterials)
+    return hashlib.md5(key.encode()).hexdigest()
+
+def getCachedMaterial(cacheKey):
+    materialName = MATERIAL_CACHE.get(cacheKey)
+    if materialName is None:
+        return None
+
+    return bpy.data.materials.get(materialName)
+
+def cacheMaterial(cacheKey, material):
+    if material is not None:
+        MATERIAL_CACHE[cacheKey] = material.name
+
+    return material
+
+# Objects imported during this session, keyed by the real path of their OBJ file.
+# Copies placed from these are not cached, only the object parsed from the file is.
+OBJECT_CACHE = {}
+
+def getCachedObject(objectFile):
+    objectName = OBJECT_CACHE.get(os.path.realpath(objectFile))
+    if objectName is None:
+        return None
+
+    return bpy.data.objects.get(objectName)
+
+# Last numeric suffix handed out per object name, so dupes don't probe every suffix from .001 again.
+OBJECT_NAME_COUNTERS = {}
+
+def getUniqueObjectName(name):
+    if name not in bpy.data.objects:
+        return name
+
+    objindex = OBJECT_NAME_COUNTERS.get(name, 0)
+    newname = name
+
+    while newname in bpy.data.objects:
+        objindex += 1
+        newname = name + '.' + str(objindex).rjust(3, '0')
+
+    OBJECT_NAME_COUNTERS[name] = objindex
+    return newname
+
+# Parsed terrain layer files, keyed by real path and modification time so re-exported files are read again.
+# Missing or unreadable files are not cached, as most materials have no layer file at all.
+LAYER_JSON_CACHE = {}
+
+def loadLayerJSON(jsonFile):
+    jsonPath = os.path.realpath(jsonFile)
+    try:
+        cacheKey = (jsonPath, os.stat(jsonPath).st_mtime_ns)
+    except OSError:
+        return {}
+
+    if cacheKey not in LAYER_JSON_CACHE:
+        try:
+            with open(jsonPath, 'rb') as fp:
+                LAYER_JSON_CACHE[cacheKey] = json.loads(fp.read())
+        except:
+            return {}
+
+    return LAYER_JSON_CACHE[cacheKey]
+
+# Parsed material libraries (.mtl), keyed by real path and modification time so re-exported files are read again.
+# Texture paths are stored as written and joined with the importing OBJ's directory on every lookup.
+MTL_CACHE = {}
+
+def loadMaterialLibrary(mtlFile, baseDir):
+    mtlPath = os.path.realpath(mtlFile)
+    cacheKey = (mtlPath, os.stat(mtlPath).st_mtime_ns)
+
+    textures = MTL_CACHE.get(cacheKey)
+    if textures is None:
+        with open(mtlPath, 'r') as f:
+            lines = f.read().split('\n')
+
+        textures = dict()
+        matname = ''
+        for line in lines:
+            if line.startswith('newmtl '):
+                matname = normalizeName(line.split(None, 2)[1])
+            elif line.startswith('map_Kd '):
+                textures[matname] = line.split(None, 2)[1]
+
+        MTL_CACHE[cacheKey] = textures
+
+    return {matname: os.path.join(baseDir, texture) for matname, texture in textures.items()}
+
+# Placement empties are copied from one unlinked template instead of being created from scratch.
+EMPTY_TEMPLATE_NAME = None
+
+def createEmpty(name):
+    global EMPTY_TEMPLATE_NAME
+
+    template = bpy.data.objects.get(EMPTY_TEMPLATE_NAME) if EMPTY_TEMPLATE_NAME else None
+    if template is None:
+        template = bpy.data.objects.new('WoW empty template', None)
+        EMPTY_TEMPLATE_NAME = template.name
+
+    empty = template.copy()
+    empty.name = name
+    return empty
+
+# The caches above refer to data by name, which means nothing once another file is loaded.
+@persistent
+def clearSessionCaches(dummy):
+    global EMPTY_TEMPLATE_NAME
+
+    MATERIAL_CACHE.clear()
+    OBJECT_CACHE.clear()
+    OBJECT_NAME_COUNTERS.clear()
+    EMPTY_TEMPLATE_NAME = None
+
+# Replace the handler registered by a previous load of this module rather than adding another.
+for handler in [h for h in bpy.app.handlers.load_post if getattr(h, '__name__', None) == clearSessionCaches.__name__]:
+    bpy.app.handlers.load_post.remove(handler)
+
+bpy.app.handlers.load_post.append(clearSessionCaches)
+
 def createStandardMaterial(materialName, textureLocation, blendMode, createEmissive):
     material = bpy.data.materials.new(name=materialName)
     material.use_nodes = True
@@ -114,20 +246,14 @@ def createStandardMaterial(materialName, textureLocation, blendMode, createEmiss
     return material
 
 
-MIX_NODE_COLOR_SOCKETS = {'in': {}, 'out': {}}
-
-def calculate_color_sockets(mix_node):
-    input_index = 0
-    for idx, i in enumerate(mix_node.inputs):
-        if 'Fac' in i.name and i.type == 'VALUE':
-            MIX_NODE_COLOR_SOCKETS['in']['Factor'] = idx
-        if i.type == 'RGBA':
-            MIX_NODE_COLOR_SOCKETS['in'][('A', 'B')[input_index]] = idx
-            input_index += 1
-
-    for idx, i in enumerate(mix_node.outputs):
-        if i.type == 'RGBA':
-            MIX_NODE_COLOR_SOCKETS['out']['Result'] = idx
+# Socket indices of the color inputs and output of a mix node.
+# ShaderNodeMix (3.4+) exposes float, vector and color variants of each socket, in that order.
+if IS_B34:
+    MIX_NODE_TYPE = 'ShaderNodeMix'
+    MIX_NODE_COLOR_SOCKETS = {'in': {'Factor': 0, 'A': 6, 'B': 7}, 'out': {'Result': 2}}
+else:
+    MIX_NODE_TYPE = 'ShaderNodeMixRGB'
+    MIX_NODE_COLOR_SOCKETS = {'in': {'Factor': 0, 'A': 1, 'B': 2}, 'out': {'Result': 0}}
 
 def createBlendedTerrain(materialName, textureLocation, layers, baseDir):
     material = bpy.data.materials.new(name=materialName)
@@ -222,18 +348,12 @@ def createBlendedTerrain(materialName, textureLocation, layers, baseDir):
         last_mix_node = None
 
         for idx, layer in enumerate(layers[1:]):
-            try:
-                mix_node = nodes.new('ShaderNodeMix')
-                mix_node.location = (-300, last_mix_node_pos + 200)
-                mix_node.data_type = 'RGBA'
-                last_mix_node_pos += 200
-            except:
-                mix_node = nodes.new('ShaderNodeMixRGB')
-                mix_node.location = (-300, last_mix_node_pos + 200)
-                last_mix_node_pos += 200
+            mix_node = nodes.new(MIX_NODE_TYPE)
+            mix_node.location = (-300, last_mix_node_pos + 200)
+            last_mix_node_pos += 200
 
-            if not MIX_NODE_COLOR_SOCKETS['in']:
-                calculate_color_sockets(mix_node)
+            if IS_B34:
+                mix_node.data_type = 'RGBA'
 
             node_tree.links.new(
                 alpha_map_channels.outputs[idx],
@@ -305,9 +425,9 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
     ### OBJ wide
     material_libs = set()
     mtlfile = ''
-    verts = []
-    normals = []
-    uvs = []
+    vertLines = []
+    normalLines = []
+    uvLines = []
     meshes = []
 
     ### Per group
@@ -315,8 +435,8 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
         def __init__(self):
             self.usemtl = ''
             self.name = ''
-            self.verts = set()
-            self.faces = []
+            self.faceStart = 0
+            self.faces = None
 
     json_info = {}
     try:
@@ -337,39 +457,52 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
     matBlendModes = defaultdict(list)
     meshIndex = -1
     with open(objectFile, 'rb') as f:
-        for line in f:
-            line_split = line.split()
-            if not line_split:
-                continue
-            line_start = line_split[0]
+        data = f.read()
+
+    # Count faces up front so their indices can be written into a preallocated buffer.
+    faceCount = data.count(b'\nf ') + data.startswith(b'f ')
+    faceIndices = array('i', [0]) * (faceCount * 3)
+    faceOffset = 0
+
+    # Read the whole file at once and dispatch on the record prefix of each line,
+    # so that only the lines we handle are ever tokenized.
+    for line in data.split(b'\n'):
+        if line.startswith(b'f '):
+            a, b, c = line.split(None, 4)[1:4]
+            faceIndices[faceOffset] = int(a.split(b'/', 1)[0]) - 1
+            faceIndices[faceOffset + 1] = int(b.split(b'/', 1)[0]) - 1
+            faceIndices[faceOffset + 2] = int(c.split(b'/', 1)[0]) - 1
+            faceOffset += 3
+        elif line.startswith(b'v '):
+            # Vertex data is only collected here and converted in bulk below.
+            vertLines.append(line[2:])
+        elif line.startswith(b'vn '):
+            normalLines.append(line[3:])
+        elif line.startswith(b'vt'):
+            layer_index = 0
+            line_data = line[3:]
+
+            # Additional UV layers use non-standard vt2, vt3, etc. prefixes.
+            if line[2:3] != b' ':
+                layer_index = int(line[2:3]) - 1
+                line_data = line[4:]
+
+            if len(uvLines) <= layer_index:
+                uvLines.append([])
+
+            uvLines[layer_index].append(line_data)
+        elif line.startswith((b'g ', b'usemtl ', b'mtllib ')):
+            # Only the keyword and the first token after it are used, so cap the split there.
+            line_start, line_value = line.split(None, 2)[:2]
             if line_start == b'mtllib':
-                mtlfile = line_split[1]
-            elif line_start == b'v':
-                verts.append([float(v) for v in line_split[1:]])
-            elif line_start == b'vn':
-                normals.append([float(v) for v in line_split[1:]])
-            elif line_start.startswith(b'vt'):
-                layer_index = 0
-
-                if len(line_start) > 2:
-                    line_str = line_start.decode('utf8')
-                    layer_index = int(line_str[-1]) - 1
-
-                if len(uvs) <= layer_index:
-                    uvs.append([])
-
-                uvs[layer_index].append([float(v) for v in line_split[1:]])
-            elif line_start == b'f':
-                line_split = line_split[1:]
-                fv = [int(v.split(b'/')[0]) for v in line_split]
-                meshes[meshIndex].faces.append((fv[0], fv[1], fv[2]))
-                meshes[meshIndex].verts.update([i - 1 for i in fv])
+                mtlfile = line_value
             elif line_start == b'g':
                 meshIndex += 1
                 meshes.append(OBJMesh())
-                meshes[meshIndex].name = line_split[1].decode('utf-8')
+                meshes[meshIndex].name = line_value.decode('utf-8')
+                meshes[meshIndex].faceStart = faceOffset // 3
             elif line_start == b'usemtl':
-                materialName = normalizeName(line_split[1].decode('utf-8'))
+                materialName = normalizeName(line_value.decode('utf-8'))
 
                 if settings.useAlpha:
                     blendingMode = None
@@ -389,63 +522,48 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
 
                 meshes[meshIndex].usemtl = materialName
 
+    verts = np.fromstring(b' '.join(vertLines), dtype=np.float32, sep=' ').reshape(-1, 3)
+    normals = np.fromstring(b' '.join(normalLines), dtype=np.float32, sep=' ').reshape(-1, 3)
+    uvs = [np.fromstring(b' '.join(layer), dtype=np.float32, sep=' ').reshape(-1, 2) for layer in uvLines]
+
+    faces = np.frombuffer(faceIndices, dtype=np.intc).reshape(-1, 3)
+    for mesh, nextMesh in zip(meshes, meshes[1:] + [None]):
+        mesh.faces = faces[mesh.faceStart:nextMesh.faceStart if nextMesh else len(faces)]
+
     # Defaults to master collection if no collection exists.
     collection = bpy.context.view_layer.active_layer_collection.collection.objects
 
     ## Materials file (.mtl)
     materials = dict()
-    matname = ''
-    matfile = ''
     if mtlfile != '':
-        with open(os.path.join(baseDir, mtlfile.decode('utf-8') ), 'r') as f:
-            for line in f:
-                line_split = line.split()
-                if not line_split:
-                    continue
-                line_start = line_split[0]
-
-                if line_start == 'newmtl':
-                    matname = normalizeName(line_split[1])
-                elif line_start == 'map_Kd':
-                    matfile = line_split[1]
-                    materials[matname] = os.path.join(baseDir, matfile)
+        materials = loadMaterialLibrary(os.path.join(baseDir, mtlfile.decode('utf-8')), baseDir)
 
     if bpy.ops.object.select_all.poll():
         bpy.ops.object.select_all(action='DESELECT')
 
 
-    # TODO: Better handling for dupes?
-    objname = os.path.basename(objectFile)
-
-    if objname in bpy.data.objects:
-        objindex = 1
-        newname = objname
-        while(newname in bpy.data.objects):
-            newname = objname + '.' + str(objindex).rjust(3, '0')
-            objindex += 1
+    objname = getUniqueObjectName(os.path.basename(objectFile))
 
     newmesh = bpy.data.meshes.new(objname)
     obj = bpy.data.objects.new(objname, newmesh)
 
     # Create a new material instance for each material entry.
+    materialSlots = {}
     if settings.importTextures:
         usedMaterials = {mesh.usemtl for mesh in meshes}
 
         for materialName, textureLocation in materials.items():
-            material = bpy.data.materials.get(materialName)
+            cacheKey = getMaterialCacheKey(textureLocation, -1, settings)
+            material = bpy.data.materials.get(materialName) or getCachedMaterial(cacheKey)
             materialB = {}
             for bm in matBlendModes[materialName]:
                 materialBName = materialName + '_B' + str(bm)
-                materialB[bm] = (materialBName, bpy.data.materials.get(materialBName))
+                materialBKey = getMaterialCacheKey(textureLocation, bm, settings)
+                materialB[bm] = (materialBName, bpy.data.materials.get(materialBName) or getCachedMaterial(materialBKey))
 
             if material is None:
                 if settings.useTerrainBlending:
-                    material_json = {}
-                    try:
-                        with open(os.path.join(baseDir, materialName + '.json')) as fp:
-                            material_json = json.load(fp)
-                    except:
-                        pass
+                    material_json = loadLayerJSON(os.path.join(baseDir, materialName + '.json'))
 
                     if 'layers' in material_json:
                         material = createBlendedTerrain(materialName, textureLocation, material_json['layers'], baseDir)
@@ -453,85 +571,76 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                 if material is None and materialName in usedMaterials:
                     material = createStandardMaterial(materialName, textureLocation, -1, False)
 
+                cacheMaterial(cacheKey, material)
+
             if settings.useAlpha:
                 for bm, (materialBName, materialBMat) in materialB.items():
                     # create materials with different blending modes
                     if materialBName in usedMaterials and materialBMat is None:
-                        materialB[bm] = (materialBName, createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials))
+                        materialBMat = createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials)
+                        materialB[bm] = (materialBName, cacheMaterial(getMaterialCacheKey(textureLocation, bm, settings), materialBMat))
 
+            # Cached materials may be named differently, so slots are tracked by the name used in the OBJ.
             if materialName in usedMaterials:
+                materialSlots[materialName] = len(obj.data.materials)
                 obj.data.materials.append(material)
 
             for (materialBName, materialBMat) in materialB.values():
                 if materialBName in usedMaterials:
+                    materialSlots[materialBName] = len(obj.data.materials)
                     obj.data.materials.append(materialBMat)
 
     ## Meshes
-    bm = bmesh.new()
-
-    i = 0
-    for v in verts:
-        vert = bm.verts.new(v)
-        vert.normal = normals[i]
-        i = i + 1
-
-    bm.verts.ensure_lookup_table()
-    bm.verts.index_update()
-
-    for mesh in meshes:
-        exampleFaceSet = False
-        for face in mesh.faces:
-            try:
-                ## TODO: Must be a better way to do this, this is already much faster than doing material every face, but still.
-                if exampleFaceSet == False:
-                    bm.faces.new((
-                        bm.verts[face[0] - 1],
-                        bm.verts[face[1] - 1],
-                        bm.verts[face[2] - 1]
-                    ))
-                    bm.faces.ensure_lookup_table()
-
-                    if mesh.usemtl:
-                        bm.faces[-1].material_index = obj.data.materials.find(mesh.usemtl)
-
-                    bm.faces[-1].smooth = True
-                    exampleFace = bm.faces[-1]
-                    exampleFaceSet = True
-                else:
-                    ## Use example face if set to speed up material copy!
-                    bm.faces.new((
-                        bm.verts[face[0] - 1],
-                        bm.verts[face[1] - 1],
-                        bm.verts[face[2] - 1]
-                    ), exampleFace)
-            except ValueError:
-                ## TODO: Duplicate faces happen for some reason
-                pass
+    # Resolve the material slot once per group and expand it to every face of that group.
+    meshMaterials = [materialSlots.get(mesh.usemtl, 0) for mesh in meshes]
+    faceMaterials = np.repeat(np.array(meshMaterials, dtype=np.int32), [len(mesh.faces) for mesh in meshes])
+
+    # Drop duplicate and degenerate triangles here, as bmesh used to reject them.
+    sortedFaces = np.sort(faces, axis=1)
+    keepFaces = np.zeros(len(faces), dtype=bool)
+    keepFaces[np.unique(sortedFaces, axis=0, return_index=True)[1]] = True
+    keepFaces &= (sortedFaces[:, 0] != sortedFaces[:, 1]) & (sortedFaces[:, 1] != sortedFaces[:, 2])
+
+    meshFaces = faces[keepFaces]
+    faceMaterials = faceMaterials[keepFaces]
+
+    newmesh.from_pydata(verts.tolist(), [], meshFaces.tolist())
+    newmesh.polygons.foreach_set('material_index', faceMaterials)
+    newmesh.polygons.foreach_set('use_smooth', [True] * len(meshFaces))
+
+    # Read back the vertex of every loop so per-vertex UVs can be expanded to per-loop UVs by indexing.
+    loopVerts = np.empty(len(newmesh.loops), dtype=np.int32)
+    newmesh.loops.foreach_get('vertex_index', loopVerts)
 
     for layer_index, layer in enumerate(uvs):
         uv_name = layer_index > 0 and ('UV' + str(layer_index + 1) + 'Map') or 'UVMap'
-        uv_layer = bm.loops.layers.uv.new(uv_name)
+        uv_layer = newmesh.uv_layers.new(name=uv_name)
+        uv_layer.data.foreach_set('uv', layer[loopVerts].ravel())
 
-        for face in bm.faces:
-            for loop in face.loops:
-                loop[uv_layer].uv = layer[loop.vert.index]
+    newmesh.update()
 
-    bm.to_mesh(newmesh)
-    bm.free()
+    # Vertex normals are derived data from Blender 3.1 onwards and can no longer be written.
+    if len(normals) == len(verts):
+        try:
+            newmesh.vertices.foreach_set('normal', normals.ravel())
+        except (AttributeError, TypeError):
+            pass
 
     # needed to have a mesh before we can create vertex groups, so do that now
     if settings.createVertexGroups:
         for mesh in sorted(meshes, key=lambda m: m.name.lower()):
             vg = obj.vertex_groups.new(name=f"{mesh.name}")
-            vg.add(list(mesh.verts), 1.0, "REPLACE")
+            vg.add(np.unique(mesh.faces).tolist(), 1.0, "REPLACE")
 
     ## Rotate object the right way
     obj.rotation_euler = [0, 0, 0]
-    obj.rotation_euler.x = radians(90)
+    obj.rotation_euler.x = HALF_PI
 
     collection.link(obj)
     obj.select_set(True)
 
+    OBJECT_CACHE[os.path.realpath(objectFile)] = obj.name
+
     ## WoW coordinate system
     max_size = 51200 / 3
     map_size = max_size * 2
@@ -543,152 +652,204 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
 
     if use_csv and os.path.exists(csvPath):
         with open(csvPath) as csvFile:
-            reader = csv.DictReader(csvFile, delimiter=';')
-            if 'Type' in reader.fieldnames:
+            reader = csv.reader(csvFile, delimiter=';')
+
+            # Resolve column indices from the header once rather than building a dict per row.
+            columns = {name: index for index, name in enumerate(next(reader, []))}
+            if 'Type' in columns:
                 importType = 'ADT'
 
                 wmoparent = None
                 if settings.importWMO:
-                    wmoparent = bpy.data.objects.new('WMOs', None)
+                    wmoparent = createEmpty('WMOs')
                     wmoparent.parent = obj
                     wmoparent.name = 'WMOs'
                     wmoparent.rotation_euler = [0, 0, 0]
-                    wmoparent.rotation_euler.x = radians(-90)
+                    wmoparent.rotation_euler.x = -HALF_PI
                     collection.link(wmoparent)
 
                 doodadparent = None
                 if settings.importM2:
-                    doodadparent = bpy.data.objects.new('Doodads', None)
+                    doodadparent = createEmpty('Doodads')
                     doodadparent.parent = obj
                     doodadparent.name = 'Doodads'
                     doodadparent.rotation_euler = [0, 0, 0]
-                    doodadparent.rotation_euler.x = radians(-90)
+                    doodadparent.rotation_euler.x = -HALF_PI
                     collection.link(doodadparent)
 
                 gobjparent = None
                 if settings.importGOBJ:
-                    gobjparent = bpy.data.objects.new('GameObjects', None)
+                    gobjparent = createEmpty('GameObjects')
                     gobjparent.parent = obj
                     gobjparent.name = 'GameObjects'
                     gobjparent.rotation_euler = [0, 0, 0]
-                    gobjparent.rotation_euler.x = radians(-90)
+                    gobjparent.rotation_euler.x = -HALF_PI
                     collection.link(gobjparent)
             else:
                 importType = 'WMO'
                 if not givenParent:
                     print('WMO import without given parent, creating..')
                     if settings.importWMOSets:
-                        givenParent = bpy.data.objects.new('WMO parent', None)
+                        givenParent = createEmpty('WMO parent')
                         givenParent.parent = obj
                         givenParent.name = 'Doodads'
                         givenParent.rotation_euler = [0, 0, 0]
-                        givenParent.rotation_euler.x = radians(-90)
+                        givenParent.rotation_euler.x = -HALF_PI
                         collection.link(givenParent)
+
+            modelFileIndex = columns['ModelFile']
+            positionXIndex, positionYIndex, positionZIndex = columns['PositionX'], columns['PositionY'], columns['PositionZ']
+            rotationXIndex, rotationYIndex, rotationZIndex = columns['RotationX'], columns['RotationY'], columns['RotationZ']
+            rotationWIndex = columns.get('RotationW')
+            scaleFactorIndex = columns['ScaleFactor']
+            modelIdIndex = columns.get('ModelId')
+            typeIndex = columns.get('Type')
+
+            # Bind everything used per row to locals once, rather than resolving it again for every placement.
+            importWMO, importM2, importGOBJ, importWMOSets = settings.importWMO, settings.importM2, settings.importGOBJ, settings.importWMOSets
+            allowDuplicates = settings.allowDuplicates
+            basename, joinPath, pathExists = os.path.basename, os.path.join, os.path.exists
+
+            scene = bpy.context.scene
+            tempModelIDSet = set()
+            if importType == 'ADT' and 'importedModelIDs' in scene:
+                tempModelIDSet.update(scene['importedModelIDs'])
+
+            # Pick the rows that will be placed first, so skipped rows are never parsed.
+            rows = []
             for row in reader:
+                if not row:
+                    continue
+
                 if importType == 'ADT':
-                    if 'importedModelIDs' in bpy.context.scene:
-                        tempModelIDList = bpy.context.scene['importedModelIDs']
-                    else:
-                        tempModelIDList = []
-                    if row['ModelId'] in tempModelIDList:
-                        if not settings.allowDuplicates:
-                            print('Skipping already imported model ' + row['ModelId'])
+                    modelId = row[modelIdIndex]
+                    if modelId in tempModelIDSet:
+                        if not allowDuplicates:
+                            print('Skipping already imported model ' + modelId)
                             continue
                     else:
-                        tempModelIDList.append(row['ModelId'])
+                        tempModelIDSet.add(modelId)
 
+                    modelType = row[typeIndex]
+                    if not ((modelType == 'wmo' and importWMO) or (modelType == 'm2' and importM2) or (modelType == 'gobj' and importGOBJ)):
+                        continue
+                elif not importWMOSets:
+                    continue
+
+                rows.append(row)
+
+            # Parse positions and rotations for all placed rows at once, converting rotations to radians in one pass.
+            transformIndices = (positionXIndex, positionYIndex, positionZIndex, rotationXIndex, rotationYIndex, rotationZIndex)
+            transforms = np.array([[row[index] for index in transformIndices] for row in rows], dtype=np.float64).reshape(-1, 6)
+            rotationsRad = np.radians(transforms[:, 3:])
+
+            for row, transform, rotationRad in zip(rows, transforms.tolist(), rotationsRad.tolist()):
+                modelFile = row[modelFileIndex]
+                positionX, positionY, positionZ, rotationX, rotationY, rotationZ = transform
+                rotationXRad, rotationYRad, rotationZRad = rotationRad
+                scaleFactor = float(row[scaleFactorIndex]) if row[scaleFactorIndex] else None
+
+                if importType == 'ADT':
                     # ADT CSV
-                    if row['Type'] == 'wmo' and settings.importWMO:
-                        print('ADT WMO import: ' + row['ModelFile'])
+                    modelType = row[typeIndex]
+                    if modelType == 'wmo':
+                        print('ADT WMO import: ' + modelFile)
 
                         # Make WMO parent that holds WMO and doodads
-                        parent = bpy.data.objects.new(os.path.basename(row['ModelFile']) + ' parent', None)
+                        parent = createEmpty(basename(modelFile) + ' parent')
                         parent.parent = wmoparent
-                        parent.location = (max_size - float(row['PositionX']), (max_size - float(row['PositionZ'])) * -1, float(row['PositionY']))
+                        parent.location = (max_size - positionX, (max_size - positionZ) * -1, positionY)
                         parent.rotation_euler = [0, 0, 0]
-                        parent.rotation_euler.x += radians(float(row['RotationZ']))
-                        parent.rotation_euler.y += radians(float(row['RotationX']))
-                        parent.rotation_euler.z = radians((90 + float(row['RotationY'])))
+                        parent.rotation_euler.x += rotationZRad
+                        parent.rotation_euler.y += rotationXRad
+                        parent.rotation_euler.z = HALF_PI + rotationYRad
 
-                        if row['ScaleFactor']:
-                            parent.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
+                        if scaleFactor is not None:
+                            parent.scale = (scaleFactor, scaleFactor, scaleFactor)
 
                         collection.link(parent)
 
                         ## Only import OBJ if model is not yet in scene, otherwise copy existing
-                        if os.path.basename(row['ModelFile']) not in bpy.data.objects:
-                            importedFile = importWoWOBJ(os.path.join(baseDir, row['ModelFile']), parent, settings)
+                        modelPath = joinPath(baseDir, modelFile)
+                        originalObject = getCachedObject(modelPath)
+                        if originalObject is None:
+                            importedFile = importWoWOBJ(modelPath, parent, settings)
                         else:
                             ## Don't copy WMOs with doodads!
-                            if os.path.exists(os.path.join(baseDir, row['ModelFile'].replace('.obj', '_ModelPlacementInformation.csv'))):
-                                importedFile = importWoWOBJ(os.path.join(baseDir, row['ModelFile']), parent, settings)
+                            if pathExists(modelPath.replace('.obj', '_ModelPlacementInformation.csv')):
+                                importedFile = importWoWOBJ(modelPath, parent, settings)
                             else:
-                                originalObject = bpy.data.objects[os.path.basename(row['ModelFile'])]
                                 importedFile = originalObject.copy()
                                 importedFile.data = originalObject.data.copy()
                                 collection.link(importedFile)
 
                         importedFile.parent = parent
-                    elif row['Type'] == 'm2' and settings.importM2:
-                        print('ADT M2 import: ' + row['ModelFile'])
+                    elif modelType == 'm2':
+                        print('ADT M2 import: ' + modelFile)
 
                         ## Only import OBJ if model is not yet in scene, otherwise copy existing
-                        if os.path.basename(row['ModelFile']) not in bpy.data.objects:
-                            importedFile = importWoWOBJ(os.path.join(baseDir, row['ModelFile']), None, settings)
+                        modelPath = joinPath(baseDir, modelFile)
+                        originalObject = getCachedObject(modelPath)
+                        if originalObject is None:
+                            importedFile = importWoWOBJ(modelPath, None, settings)
                         else:
-                            originalObject = bpy.data.objects[os.path.basename(row['ModelFile'])]
                             importedFile = originalObject.copy()
                             importedFile.rotation_euler = [0, 0, 0]
-                            importedFile.rotation_euler.x = radians(90)
+                            importedFile.rotation_euler.x = HALF_PI
                             collection.link(importedFile)
 
                         importedFile.parent = doodadparent
 
-                        importedFile.location.x = (max_size - float(row['PositionX']))
-                        importedFile.location.y = (max_size - float(row['PositionZ'])) * -1
-                        importedFile.location.z = float(row['PositionY'])
-                        importedFile.rotation_euler.x += radians(float(row['RotationZ']))
-                        importedFile.rotation_euler.y += radians(float(row['RotationX']))
-                        importedFile.rotation_euler.z = radians(90 + float(row['RotationY']))
-                        if row['ScaleFactor']:
-                            importedFile.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
-                    elif row['Type'] == 'gobj' and settings.importGOBJ:
-                        if os.path.basename(row['ModelFile']) not in bpy.data.objects:
-                            importedFile = importWoWOBJ(os.path.join(baseDir, row['ModelFile']), None, settings)
+                        importedFile.location.x = (max_size - positionX)
+                        importedFile.location.y = (max_size - positionZ) * -1
+                        importedFile.location.z = positionY
+                        importedFile.rotation_euler.x += rotationZRad
+                        importedFile.rotation_euler.y += rotationXRad
+                        importedFile.rotation_euler.z = HALF_PI + rotationYRad
+                        if scaleFactor is not None:
+                            importedFile.scale = (scaleFactor, scaleFactor, scaleFactor)
+                    elif modelType == 'gobj':
+                        modelPath = joinPath(baseDir, modelFile)
+                        originalObject = getCachedObject(modelPath)
+                        if originalObject is None:
+                            importedFile = importWoWOBJ(modelPath, None, settings)
                         else:
-                            originalObject = bpy.data.objects[os.path.basename(row['ModelFile'])]
                             importedFile = originalObject.copy()
                             importedFile.rotation_euler = [0, 0, 0]
-                            importedFile.rotation_euler.x = radians(90)
+                            importedFile.rotation_euler.x = HALF_PI
                             collection.link(importedFile)
 
                         importedFile.parent = gobjparent
-                        importedFile.location = (float(row['PositionY']), -float(row['PositionX']), float(row['PositionZ']))
-                        rotQuat = Quaternion((float(row['RotationX']), float(row['RotationY']), -float(row['RotationZ']), float(row['RotationW'])))
-                        rotEul = rotQuat.to_euler()
+                        importedFile.location = (positionY, -positionX, positionZ)
+                        rotQuat = (rotationX, rotationY, -rotationZ, float(row[rotationWIndex]))
+                        rotEul = Euler() if rotQuat == IDENTITY_QUATERNION else Quaternion(rotQuat).to_euler()
                         importedFile.rotation_euler = rotEul
-                        if row['ScaleFactor']:
-                            importedFile.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
-                    bpy.context.scene['importedModelIDs'] = tempModelIDList
-                elif settings.importWMOSets:
+                        if scaleFactor is not None:
+                            importedFile.scale = (scaleFactor, scaleFactor, scaleFactor)
+                else:
                     # WMO CSV
-                    print('WMO M2 import: ' + row['ModelFile'])
-                    if os.path.basename(row['ModelFile']) not in bpy.data.objects:
-                        importedFile = importWoWOBJ(os.path.join(baseDir, row['ModelFile']), None, settings)
+                    print('WMO M2 import: ' + modelFile)
+                    modelPath = joinPath(baseDir, modelFile)
+                    originalObject = getCachedObject(modelPath)
+                    if originalObject is None:
+                        importedFile = importWoWOBJ(modelPath, None, settings)
                     else:
-                        originalObject = bpy.data.objects[os.path.basename(row['ModelFile'])]
                         importedFile = originalObject.copy()
                         collection.link(importedFile)
 
-                    importedFile.location = (float(row['PositionX']), float(row['PositionY']), float(row['PositionZ']))
+                    importedFile.location = (positionX, positionY, positionZ)
 
                     importedFile.rotation_euler = [0, 0, 0]
-                    rotQuat = Quaternion((float(row['RotationW']), float(row['RotationX']), float(row['RotationY']), float(row['RotationZ'])))
-                    rotEul = rotQuat.to_euler()
-                    rotEul.x += radians(90)
+                    rotQuat = (float(row[rotationWIndex]), rotationX, rotationY, rotationZ)
+                    rotEul = Euler() if rotQuat == IDENTITY_QUATERNION else Quaternion(rotQuat).to_euler()
+                    rotEul.x += HALF_PI
                     importedFile.rotation_euler = rotEul
                     importedFile.parent = givenParent or obj
-                    if row['ScaleFactor']:
-                        importedFile.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
+                    if scaleFactor is not None:
+                        importedFile.scale = (scaleFactor, scaleFactor, scaleFactor)
+
+            # Writing an ID property is not free, so only store the imported IDs once all rows are done.
+            if importType == 'ADT' and tempModelIDSet:
+                scene['importedModelIDs'] = list(tempModelIDSet)
 
     return obj